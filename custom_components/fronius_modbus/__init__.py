@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import Platform
 
 from homeassistant.const import CONF_NAME, CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
@@ -13,6 +13,7 @@ from .const import (
     DOMAIN,
     CONF_INVERTER_UNIT_ID,
     CONF_METER_UNIT_ID,
+    CONF_STORAGE_INFO,
 )
 
 from . import hub
@@ -42,13 +43,35 @@ async def async_setup_entry(hass: HomeAssistant, entry: HubConfigEntry) -> bool:
     # with your actual devices.
     entry.runtime_data = hub.Hub(hass = hass, name = name, host = host, port = port, inverter_unit_id=inverter_unit_id, meter_unit_ids=meter_unit_ids, scan_interval = scan_interval)
     
-    await entry.runtime_data.init_data()
+    cached_storage_info = entry.options.get(CONF_STORAGE_INFO)
+    await entry.runtime_data.init_data(storage_info=cached_storage_info)
+
+    if not cached_storage_info is None and entry.runtime_data.storage_configured:
+        # setup used the cached storage details, check them without delaying the setup
+        entry.async_create_background_task(hass, _async_refresh_storage_info(hass, entry), f'{DOMAIN} storage info')
+    else:
+        _async_save_storage_info(hass, entry)
 
     # This creates each HA object for each platform your device requires.
     # It's done by calling the `async_setup_entry` function in each platform module.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
+@callback
+def _async_save_storage_info(hass: HomeAssistant, entry: HubConfigEntry) -> bool:
+    """Keep the storage details so later setups skip the http request."""
+    storage_info = entry.runtime_data.storage_info
+    if storage_info is None or storage_info == entry.options.get(CONF_STORAGE_INFO):
+        return False
+    hass.config_entries.async_update_entry(entry, options={**entry.options, CONF_STORAGE_INFO: storage_info})
+    return True
+
+async def _async_refresh_storage_info(hass: HomeAssistant, entry: HubConfigEntry) -> None:
+    """Re-read the cached storage details, reload to update the device when they changed."""
+    if await entry.runtime_data.refresh_storage_info() and _async_save_storage_info(hass, entry):
+        _LOGGER.info(f"Storage details changed, reloading {entry.title}")
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     # This is called when an entry/configured device is to be removed. The class
@@ -6,8 +6,10 @@ _LOGGER = logging.getLogger(__name__)
 
 class FroniusModbusBaseEntity():
     """ """
-    _key = None
+    # only attributes owned by this integration, the HA entity classes keep their __dict__ for _attr_*
+    __slots__ = ('_platform_name', '_hub', '_key', '_name', '_unit_of_measurement', '_icon', '_device_info', '_last_pushed')
     _options_dict = None
+    _options_inverse = None
 
     def __init__(self, platform_name, hub, device_info, name, key, device_class=None, state_class=None, unit=None, icon=None, entity_category=None, options=None, min=None, max=None, native_step=None, mode=None):
         self._platform_name = platform_name
@@ -26,6 +28,7 @@ class FroniusModbusBaseEntity():
         if not options is None:
             self._options_dict = options
             self._attr_options = list(options.values())
+            self._options_inverse = {v: k for k, v in options.items()}
         if not min is None:
             self._attr_native_min_value = min
         if not max is None:
@@ -39,6 +42,7 @@ class FroniusModbusBaseEntity():
         self._attr_name = name
         self._attr_unique_id = f"{self._platform_name}_{self._key}"
         self._attr_device_info = device_info
+        self._last_pushed = object()
 
     async def async_added_to_hass(self):
         """Register callbacks."""
@@ -49,6 +53,11 @@ class FroniusModbusBaseEntity():
 
     @callback
     def _modbus_data_updated(self):
+        # only write the state when the value of this entity changed
+        value = self._hub.data.get(self._key)
+        if value == self._last_pushed:
+            return
+        self._last_pushed = value
         self.async_write_ha_state()
 
     @property
@@ -4,31 +4,26 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.helpers.entity import EntityCategory
 
+from .froniusmodbusclient_const import STORAGE_EXT_CONTROL_MODE as CLIENT_STORAGE_EXT_CONTROL_MODE
+
 DOMAIN = 'fronius_modbus'
 CONNECTION_MODBUS = 'modbus'
 DEFAULT_NAME = 'Fronius'
 ENTITY_PREFIX = 'fm'
 DEFAULT_SCAN_INTERVAL = 10
+SLOW_REFRESH_CYCLES = 10
 DEFAULT_PORT = 502
 DEFAULT_INVERTER_UNIT_ID = 1
 DEFAULT_METER_UNIT_ID = 200
 CONF_INVERTER_UNIT_ID = 'inverter_modbus_unit_id'
 CONF_METER_UNIT_ID = 'meter_modbus_unit_id'
+CONF_STORAGE_INFO = 'storage_info'
 ATTR_MANUFACTURER = 'Fronius'
 SUPPORTED_MANUFACTURERS = ['Fronius']
 SUPPORTED_MODELS = ['Primo GEN24', 'Symo GEN24']
 
-STORAGE_EXT_CONTROL_MODE = {
-    0: 'Auto',
-    1: 'PV Charge Limit',
-    2: 'Discharge Limit',
-    3: 'PV Charge and Discharge Limit',
-    4: 'Charge from Grid',
-    5: 'Discharge to Grid',
-    6: 'Block Discharging',
-    7: 'Block Charging',
-#    8: 'Calibrate',
-}
+# select options share the client's mode strings, the entity state is one of them
+STORAGE_EXT_CONTROL_MODE = dict(enumerate(CLIENT_STORAGE_EXT_CONTROL_MODE))
 
 STORAGE_SELECT_TYPES = [
     ['Storage Control Mode', 'ext_control_mode', STORAGE_EXT_CONTROL_MODE],
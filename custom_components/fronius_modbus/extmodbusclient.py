@@ -7,6 +7,7 @@ import operator
 #from datetime import timedelta, datetime
 from typing import Optional, Literal
 import struct
+import socket
 import asyncio
 
 from pymodbus.client import AsyncModbusTcpClient
@@ -16,13 +17,31 @@ from pymodbus import ExceptionResponse
 
 _LOGGER = logging.getLogger(__name__)
 
+_OPS = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_NUMERIC_TYPES = (int, float)
+
+_CONTROL_CHARS_TABLE = str.maketrans('', '', ''.join(chr(i) for i in range(32)))
+# same values as 10**sf for the scale factors sunspec devices use
+_SF_TABLE = {sf: 10**sf for sf in range(-6, 7)}
+
 class ExtModbusClient:
 
-    def __init__(self, host: str, port: int, unit_id: int, timeout: int, framer:str = None) -> None:
+    def __init__(self, host: str, port: int, unit_id: int, timeout: int, framer:str = None, max_registers_per_request: int = 125) -> None:
         """Init Class"""
         self._host = host
         self._port = port
         self._unit_id = unit_id
+        self._max_registers_per_request = max_registers_per_request
+        self._register_cache = {}
+        self._socket_options_transport = None
         self.busy = False
         if not framer is None:
             self._client = AsyncModbusTcpClient(host=host, port=port, framer=framer, timeout=timeout) 
@@ -46,28 +65,45 @@ class ExtModbusClient:
         if not self._client.connected:
             raise Exception(f"Failed to connect to {self._host}:{self._port} retries: {retries}")
         _LOGGER.debug("successfully connected to %s:%s", self._client.comm_params.host, self._client.comm_params.port)
+        self._set_socket_options()
         return True
+
+    def _set_socket_options(self):
+        """Disable Nagle and enable keepalive on the modbus tcp socket, once per transport."""
+        try:
+            transport = self._client.ctx.transport
+        except AttributeError:
+            return
+        if transport is None or transport is self._socket_options_transport:
+            return
+        sock = transport.get_extra_info('socket')
+        if sock is None:
+            return
+        self._socket_options_transport = transport
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if hasattr(socket, 'TCP_KEEPIDLE'):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+            if hasattr(socket, 'TCP_KEEPINTVL'):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+        except OSError as e:
+            _LOGGER.debug(f"Could not set socket options: {e}")
     
     async def _check_and_reconnect(self):
         if not self._client.connected:
             _LOGGER.warning("Modbus client is not connected, reconnecting...", exc_info=True)
             return await self.connect()
-        return self._client.connected
+        # pymodbus reconnects on its own without connect(), the new socket needs the options too
+        self._set_socket_options()
+        return True
 
     @property
     def connected(self) -> bool:
         return self._client.connected
 
     def validate(self, value, comparison, against):
-        ops = {
-            ">": operator.gt,
-            "<": operator.lt,
-            ">=": operator.ge,
-            "<=": operator.le,
-            "==": operator.eq,
-            "!=": operator.ne,
-        }
-        if not ops[comparison](value, against):
+        if not _OPS[comparison](value, against):
             raise ValueError(f"Value {value} failed validation ({comparison}{against})")
         return value
 
@@ -97,7 +133,9 @@ class ExtModbusClient:
                     _LOGGER.debug(f"Exception response reading register retries: {attempt}/{retries} connected {self._client.connected} address: {address} count: {count} unit id: {unit_id}  {data}")
                 else:
                     _LOGGER.debug(f"Unknown data response error reading register retries: {attempt}/{retries} connected {self._client.connected} address: {address} count: {count} unit id: {unit_id}  {data}")
-                await asyncio.sleep(.2) 
+                if attempt < retries:
+                    # exponential backoff: .1, .2, .4 ...
+                    await asyncio.sleep(.1 * (1 << attempt))
 
         if data.isError():
             _LOGGER.error(f"error reading registers. retries: {attempt}/{retries} connected {self._client.connected} register: {address} count: {count} unit id: {unit_id} retries {retries} error: {data} ")
@@ -105,20 +143,66 @@ class ExtModbusClient:
 
         return data
 
-    async def get_registers(self, unit_id, address, count, retries = 0):
+    async def get_registers(self, unit_id, address, count):
         data = await self.read_holding_registers(unit_id=unit_id, address=address, count=count)
-        if data.isError():
-            if isinstance(data,ModbusIOException):
-                if retries < 1:
-                    _LOGGER.debug(f"IO Error: {data}. Retrying...")
-                    return await self.get_registers(address=address, count=count, retries = retries + 1)
-                else:
-                    _LOGGER.error(f"error reading register: {address} count: {count} unit id: {unit_id} error: {data} ")
-            else:
-                _LOGGER.error(f"error reading register: {address} count: {count} unit id: {unit_id} error: {data} ")
+        if data is None:
             return None
         return data.registers
 
+    def plan_reads(self, spans, max_gap = 8):
+        """Merge (address, count) spans into as few read requests as possible.
+
+        Spans closer than max_gap registers are read together as long as the
+        request stays within max_registers_per_request. Spans are never split, so
+        multi register values (32 bit pairs, strings) always come from one request.
+        """
+        requests = []
+        for address, count in sorted(spans):
+            if requests:
+                start, req_count = requests[-1]
+                end = max(start + req_count, address + count)
+                if address - (start + req_count) < max_gap and end - start <= self._max_registers_per_request:
+                    requests[-1] = (start, end - start)
+                    continue
+            requests.append((address, count))
+        return requests
+
+    async def read_blocks(self, unit_id, spans, max_gap = 8):
+        """Read spans with merged requests and cache them packed until the next call.
+
+        Failed requests are cached as None so the spans they cover are not read again one by one.
+        """
+        blocks = []
+        self._register_cache[unit_id] = blocks
+        result = False
+        for address, count in self.plan_reads(spans, max_gap):
+            regs = await self.get_registers(unit_id=unit_id, address=address, count=count)
+            if regs is None:
+                blocks.append((address, count, None))
+            else:
+                blocks.append((address, count, memoryview(self.registers_to_bytes(regs))))
+                result = True
+        return result
+
+    def clear_register_cache(self, unit_id):
+        self._register_cache.pop(unit_id, None)
+
+    async def get_cached_buffer(self, unit_id, address, count):
+        """Big-endian bytes of the registers, a zero-copy view into the cached blocks if possible.
+
+        Returns None for spans of a failed request, spans not planned by read_blocks are read directly.
+        """
+        for start, block_count, buf in self._register_cache.get(unit_id, ()):
+            offset = address - start
+            if offset >= 0 and offset + count <= block_count:
+                if buf is None:
+                    return None
+                return buf[offset * 2:(offset + count) * 2]
+        regs = await self.get_registers(unit_id=unit_id, address=address, count=count)
+        if regs is None:
+            return None
+        return memoryview(self.registers_to_bytes(regs))
+
     async def write_registers(self, unit_id, address, payload):
         """Write registers."""
         await self._check_and_reconnect()
@@ -142,8 +226,10 @@ class ExtModbusClient:
     def strip_escapes(self, value:str):
         if value is None:
             return
-        filter = ''.join([chr(i) for i in range(0, 32)])
-        return value.translate(str.maketrans('', '', filter)).strip()
+        return value.translate(_CONTROL_CHARS_TABLE).strip()
+
+    def registers_to_bytes(self, regs):
+        return struct.pack(f'>{len(regs)}H', *regs)
 
     def convert_from_registers_int8(self, regs):
         return [int(regs[0] >> 8), int(regs[0] & 0xFF)]
@@ -200,6 +286,11 @@ class ExtModbusClient:
             return v
         return f'{default}'
     
+    def get_value_from_list(self, l, i, default=None):
+        if 0 <= i < len(l):
+            return l[i]
+        return default
+
     def convert_from_byte_uint16(self, byteArray, pos, type='BE'): 
         try:
             if type == 'BE':
@@ -225,13 +316,17 @@ class ExtModbusClient:
     def bitmask_to_strings(self, bitmask, bitmask_list, bits=16):
         strings = []
         len_list = len(bitmask_list)
-        for bit in range(bits):
-            if bitmask & (1<<bit):
-                if bit < len_list: 
-                    value = bitmask_list[bit]
-                else:
-                    value = f'bit {bit} undefined'
-                strings.append(value)
+        # only visit set bits: isolate the lowest set bit and clear it
+        mask = bitmask & ((1 << bits) - 1)
+        while mask:
+            lsb = mask & -mask
+            bit = lsb.bit_length() - 1
+            if bit < len_list:
+                value = bitmask_list[bit]
+            else:
+                value = f'bit {bit} undefined'
+            strings.append(value)
+            mask ^= lsb
         return strings
 
     def bitmask_to_string(self, bitmask, bitmask_list, default='NA', max_length=255, bits=16):
@@ -244,23 +339,38 @@ class ExtModbusClient:
         return default
 
     def calculate_value(self, value, sf, digits=2, lower_bound = None, upper_bound = None):
-        if self.is_numeric(value) and self.is_numeric(sf):
-            rvalue = round(value * 10**sf, digits)
-            if not lower_bound is None and rvalue < lower_bound:
-                _LOGGER.error(f'calculated value: {rvalue} below lower bound {lower_bound} value: {value} sf: {sf} digits {digits}', stack_info=True)
-                return None
-            if not upper_bound is None and rvalue > upper_bound:
-                _LOGGER.error(f'calculated value: {rvalue} above upper bound {upper_bound} value: {value} sf: {sf} digits {digits}', stack_info=True)
-                return None                    
-            return round(value * 10**sf, digits)
-        else:
+        if value is None or sf is None:
             _LOGGER.debug(f'cannot calculate non numeric value: {value} sf: {sf} digits {digits}', stack_info=True)
-        return None
-
-    def is_numeric(self, value):
-        if isinstance(value, (int, float, complex)) and not isinstance(value, bool):
-            return True
-        return False
-
-    def get_string_from_registers(self, regs):
-        return self.strip_escapes(self._client.convert_from_registers(regs, data_type = self._client.DATATYPE.STRING))
+            return None
+        factor = _SF_TABLE.get(sf)
+        if factor is None:
+            factor = 10**sf
+        return self._check_bounds(round(value * factor, digits), value, sf, digits, lower_bound, upper_bound)
+
+    def calculate_values(self, values, sf, digits=2, lower_bound = None, upper_bound = None):
+        """calculate_value for values sharing one scale factor, the factor is resolved once."""
+        if sf is None:
+            _LOGGER.debug(f'cannot calculate non numeric values: {values} sf: {sf} digits {digits}', stack_info=True)
+            return [None] * len(values)
+        factor = _SF_TABLE.get(sf)
+        if factor is None:
+            factor = 10**sf
+        check_bounds = self._check_bounds
+        return [None if value is None else check_bounds(round(value * factor, digits), value, sf, digits, lower_bound, upper_bound) for value in values]
+
+    def _check_bounds(self, rvalue, value, sf, digits, lower_bound, upper_bound):
+        if not lower_bound is None and rvalue < lower_bound:
+            _LOGGER.error(f'calculated value: {rvalue} below lower bound {lower_bound} value: {value} sf: {sf} digits {digits}', stack_info=True)
+            return None
+        if not upper_bound is None and rvalue > upper_bound:
+            _LOGGER.error(f'calculated value: {rvalue} above upper bound {upper_bound} value: {value} sf: {sf} digits {digits}', stack_info=True)
+            return None                    
+        return rvalue
+
+    @staticmethod
+    def is_numeric(value):
+        # exact type check, also excludes bool
+        return type(value) in _NUMERIC_TYPES
+
+    def get_string_from_bytes(self, value: bytes):
+        return self.strip_escapes(value.decode('utf-8', errors='ignore'))
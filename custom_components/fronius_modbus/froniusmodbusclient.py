@@ -4,17 +4,24 @@
 
 import asyncio
 import logging
+import struct
 from typing import Optional, Literal
 from .extmodbusclient import ExtModbusClient
 import requests
+from requests.adapters import HTTPAdapter
 
 from .froniusmodbusclient_const import (
-    INVERTER_ADDRESS,
-    MPPT_ADDRESS,
     COMMON_ADDRESS,
     NAMEPLATE_ADDRESS,
-    STORAGE_ADDRESS,
-    METER_ADDRESS,
+    INVERTER_SPAN,
+    MODEL_SETTINGS_SPAN,
+    INVERTER_STATUS_SPAN,
+    INVERTER_CONTROLS_SPAN,
+    MPPT_SPAN,
+    STORAGE_SPAN,
+    METER_SPAN,
+    MAX_REGISTERS_PER_REQUEST,
+    METER_MAX_BACKOFF_CYCLES,
     STORAGE_CONTROL_MODE_ADDRESS,
     MINIMUM_RESERVE_ADDRESS,
     DISCHARGE_RATE_ADDRESS,
@@ -24,6 +31,7 @@ from .froniusmodbusclient_const import (
     CHARGE_GRID_STATUS,
     STORAGE_EXT_CONTROL_MODE,
     FRONIUS_INVERTER_STATUS,
+    INVERTER_IDLE_STATUS,
     CONNECTION_STATUS_CONDENSED,
     ECP_CONNECTION_STATUS,
     INVERTER_CONTROLS,
@@ -36,17 +44,105 @@ from .froniusmodbusclient_const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount('http://', HTTPAdapter(pool_connections=2, pool_maxsize=2))
+
+# PPVphAB..PhVphC, V_SF, W, W_SF, Hz, Hz_SF, WH, WH_SF, TmpCab, Tmp_SF, StVnd, EvtVnd2
+_INVERTER_STRUCT = struct.Struct('>10x6H5h12xIh12xh6xh2xH12xI')
+# DCW_SF, DCWH_SF, then DCW and DCWH of modules 1 to 4
+_MPPT_STRUCT = struct.Struct('>4x2h30xHI34xHI34xHI34xHI')
+# WChaMax, WChaGra, WDisChaGra, StorCtl_Mod, MinRsvPct, ChaState, ChaSt, OutWRte, InWRte, ChaGriSet
+_STORAGE_STRUCT = struct.Struct('>4H2x2H4xH2h6xH')
+# PhVphA, PhVphB, PhVphC, PPV, V_SF, Hz, Hz_SF, W, W_SF, TotWhExp, TotWhImp, TotWh_SF
+_METER_STRUCT = struct.Struct('>12x4h6x4h6xh30xI12xI12xh')
+# DERTyp, WHRtg, MaxChaRte, MaxDisChaRte
+_NAMEPLATE_STRUCT = struct.Struct('>H32xH6xH2xH')
+# PVConn, StorConn, ECPConn, StActCtl
+_STATUS_STRUCT = struct.Struct('>3H60xI')
+# WMax, WMax_SF
+_MODEL_SETTINGS_STRUCT = struct.Struct('>H38xh')
+# Conn, WMaxLim_Ena, OutPFSet_Ena, VArPct_Ena
+_CONTROLS_STRUCT = struct.Struct('>4xH8xH8xH14xh')
+
+def _grid_status_index(m_online, i_grid, i_inverter, i_dead, m_dead):
+    """GRID_STATUS index for the frequency checks, None when undetermined."""
+    if m_online and i_grid:
+        return 3
+    if not m_online and i_inverter:
+        return 1
+    if i_dead:
+        if m_online:
+            return 2
+        if m_dead:
+            return 0
+    return None
+
+# every combination of the five frequency checks, packed as bits (m_online is the highest)
+_GRID_STATUS_TABLE = tuple(
+    _grid_status_index(*(bool(key & (1 << bit)) for bit in (4, 3, 2, 1, 0)))
+    for key in range(32)
+)
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+def _to_u16_scaled(value):
+    """Value with scale factor -2 as register value, the mask stores negatives as two's complement."""
+    return int(round(value * 100)) & 0xFFFF
+
+def _clamp_rate(w, max_w):
+    """Power in W as percentage of max_w, clamped to -100..100."""
+    if max_w == 0:
+        return 0
+    return max(-100.0, min(100.0, w / max_w * 100.0))
+
+def _ext_control_mode(storage_control_mode, charge_sign, discharge_sign):
+    """Extended control mode for a storage control mode and charge/discharge rate signs."""
+    if storage_control_mode == 0:
+        return 0
+    if storage_control_mode in [1,3] and charge_sign == 0:
+        return 7
+    if storage_control_mode == 1:
+        return 1
+    if storage_control_mode in [2,3] and discharge_sign < 0:
+        return 4
+    if storage_control_mode in [2,3] and charge_sign < 0:
+        return 5
+    if storage_control_mode in [2,3] and discharge_sign == 0:
+        return 6
+    if storage_control_mode == 2:
+        return 2
+    return 3
+
+# keyed on (StorCtl_Mod, sign of InWRte, sign of OutWRte)
+_EXT_CONTROL_MODE_TABLE = {
+    (mode, charge_sign, discharge_sign): _ext_control_mode(mode, charge_sign, discharge_sign)
+    for mode in range(4) for charge_sign in (-1, 0, 1) for discharge_sign in (-1, 0, 1)
+}
+
+# values of the readers skipped while the inverter is idle, lifetime energy keeps its last total
+_IDLE_MPPT_DATA = {
+    'mppt1_power': 0,
+    'mppt2_power': 0,
+    'pv_power': 0,
+}
+_IDLE_STATUS_DATA = dict.fromkeys(('pv_connection', 'storage_connection', 'ecp_connection', 'inverter_controls'))
+
 class FroniusModbusClient(ExtModbusClient):
     """Hub for BYD Battery Box Interface"""
 
     def __init__(self, host: str, port: int, inverter_unit_id: int, meter_unit_ids, timeout: int) -> None:
         """Init hub."""
-        super(FroniusModbusClient, self).__init__(host = host, port = port, unit_id=inverter_unit_id, timeout=timeout)
+        super(FroniusModbusClient, self).__init__(host = host, port = port, unit_id=inverter_unit_id, timeout=timeout, max_registers_per_request=MAX_REGISTERS_PER_REQUEST)
 
         self.initialized = False
 
         self._inverter_unit_id = inverter_unit_id
         self._meter_unit_ids = meter_unit_ids
+        self._meter_prefixes = {unit_id: f'm{i+1}_' for i, unit_id in enumerate(meter_unit_ids)}
+        self._meter_backoff = dict.fromkeys(meter_unit_ids, 0)
+        self._meter_skip = dict.fromkeys(meter_unit_ids, 0)
+        self._meters_read = ()
 
         self.meter_configured = False
         self.mppt_configured = False
@@ -61,6 +157,8 @@ class FroniusModbusClient(ExtModbusClient):
         self._inverter_frequency_lower_bound = self._grid_frequency - 5
         self._inverter_frequency_upper_bound = self._grid_frequency + 5
 
+        self.storage_info = None
+
         self.data = {}
 
     async def init_data(self):
@@ -86,10 +184,9 @@ class FroniusModbusClient(ExtModbusClient):
         #elif len(self._meter_unit_ids)>0:
         #    self.meter_configured = True
 
-        for i in range(len(self._meter_unit_ids)):
-            unit_id = self._meter_unit_ids[i]
+        for unit_id in self._meter_unit_ids:
             try:
-                result = await self.read_device_info_data(prefix=f'm{i+1}_', unit_id=unit_id)
+                result = await self.read_device_info_data(prefix=self._meter_prefixes[unit_id], unit_id=unit_id)
                 if result:
                     if not self.meter_configured:
                         self.meter_configured = True
@@ -105,15 +202,20 @@ class FroniusModbusClient(ExtModbusClient):
 
         return True
     
-    def get_json_storage_info(self):
-        self.data['s_manufacturer'] = None
-        self.data['s_model'] = 'Battery Storage'
-        self.data['s_serial'] = None
+    def get_json_storage_info(self, use_cache = True):
+        if use_cache and not self.storage_info is None:
+            self.data.update(self.storage_info)
+            return True
+
+        if self.storage_info is None:
+            self.data['s_manufacturer'] = None
+            self.data['s_model'] = 'Battery Storage'
+            self.data['s_serial'] = None
 
         url = f"http://{self._host}/solar_api/v1/GetStorageRealtimeData.cgi"
 
         try:
-            response = requests.get(url)
+            response = _HTTP_SESSION.get(url, timeout=5, stream=False)
 
             if response.status_code == 200:
                 data = response.json()
@@ -134,10 +236,13 @@ class FroniusModbusClient(ExtModbusClient):
                     _LOGGER.error(f"Error no details in json bodydata: {bodydata}")
                     return
 
-                self.data['s_manufacturer'] = details['Manufacturer']
-                self.data['s_model'] = details['Model']
-                self.data['s_serial'] = str(details['Serial']).strip()
-                break
+                self.storage_info = {
+                    's_manufacturer': details['Manufacturer'],
+                    's_model': details['Model'],
+                    's_serial': str(details['Serial']).strip(),
+                }
+                self.data.update(self.storage_info)
+                return True
  
         except Exception as e:
             _LOGGER.error(f"Error storage json data {url} {e}", exc_info=True)
@@ -147,65 +252,78 @@ class FroniusModbusClient(ExtModbusClient):
         if regs is None:
             return False
 
-        manufacturer = self.get_string_from_registers(regs[0:16])
-        model = self.get_string_from_registers(regs[16:32])
-        options = self.get_string_from_registers(regs[32:40])
-        sw_version = self.get_string_from_registers(regs[40:48])
-        serial =  self.get_string_from_registers(regs[48:64])
-        modbus_id = self._client.convert_from_registers(regs[64:65], data_type = self._client.DATATYPE.UINT16)
-
-        self.data[prefix + 'manufacturer'] = manufacturer
-        self.data[prefix + 'model'] = model
-        self.data[prefix + 'options'] = options
-        self.data[prefix + 'sw_version'] = sw_version
-        self.data[prefix + 'serial'] = serial
-        self.data[prefix + 'unit_id'] = modbus_id
+        # 2 characters per register
+        buf = self.registers_to_bytes(regs[0:64])
+        manufacturer = self.get_string_from_bytes(buf[0:32])
+        model = self.get_string_from_bytes(buf[32:64])
+        options = self.get_string_from_bytes(buf[64:80])
+        sw_version = self.get_string_from_bytes(buf[80:96])
+        serial =  self.get_string_from_bytes(buf[96:128])
+        modbus_id = regs[64]
+
+        self.data.update({
+            prefix + 'manufacturer': manufacturer,
+            prefix + 'model': model,
+            prefix + 'options': options,
+            prefix + 'sw_version': sw_version,
+            prefix + 'serial': serial,
+            prefix + 'unit_id': modbus_id,
+        })
 
         return True
 
+    @property
+    def inverter_idle(self):
+        """Inverter is off or sleeping and no storage keeps it active."""
+        return not self.storage_configured and self.data.get('statusvendor_id') in INVERTER_IDLE_STATUS
+
+    async def read_inverter_block(self, include_settings = True):
+        """Read the inverter register blocks used by this refresh with merged requests."""
+        if self.inverter_idle:
+            # only the inverter model is read while idle, directly
+            self.clear_register_cache(self._inverter_unit_id)
+            # don't keep showing the readings from before the inverter went to sleep
+            self.data.update(_IDLE_STATUS_DATA)
+            if self.mppt_configured:
+                self.data.update(_IDLE_MPPT_DATA)
+            return False
+        spans = [INVERTER_SPAN, INVERTER_STATUS_SPAN]
+        if include_settings:
+            spans += [MODEL_SETTINGS_SPAN, INVERTER_CONTROLS_SPAN]
+        if self.mppt_configured:
+            spans.append(MPPT_SPAN)
+        if self.storage_configured:
+            spans.append(STORAGE_SPAN)
+        return await self.read_blocks(unit_id=self._inverter_unit_id, spans=spans)
+
+    async def get_inverter_buffer(self, span):
+        return await self.get_cached_buffer(self._inverter_unit_id, *span)
+
     async def read_inverter_data(self):
-        regs = await self.get_registers(unit_id=self._inverter_unit_id, address=INVERTER_ADDRESS, count=50)
-        if regs is None:
+        buf = await self.get_inverter_buffer(INVERTER_SPAN)
+        if buf is None:
             return False
 
-        PPVphAB = self._client.convert_from_registers(regs[5:6], data_type = self._client.DATATYPE.UINT16)
-        PPVphBC = self._client.convert_from_registers(regs[6:7], data_type = self._client.DATATYPE.UINT16)
-        PPVphCA = self._client.convert_from_registers(regs[7:8], data_type = self._client.DATATYPE.UINT16)
-        PhVphA = self._client.convert_from_registers(regs[8:9], data_type = self._client.DATATYPE.UINT16)
-        PhVphB = self._client.convert_from_registers(regs[9:10], data_type = self._client.DATATYPE.UINT16)
-        PhVphC = self._client.convert_from_registers(regs[10:11], data_type = self._client.DATATYPE.UINT16)
-        V_SF = self._client.convert_from_registers(regs[11:12], data_type = self._client.DATATYPE.INT16)
-
-        W = self._client.convert_from_registers(regs[12:13], data_type = self._client.DATATYPE.INT16)
-        W_SF = self._client.convert_from_registers(regs[13:14], data_type = self._client.DATATYPE.INT16)
-        Hz = self._client.convert_from_registers(regs[14:15], data_type = self._client.DATATYPE.INT16)
-        Hz_SF = self._client.convert_from_registers(regs[15:16], data_type = self._client.DATATYPE.INT16)
-
-        WH = self._client.convert_from_registers(regs[22:24], data_type = self._client.DATATYPE.UINT32)
-        WH_SF = self._client.convert_from_registers(regs[24:25], data_type = self._client.DATATYPE.INT16)
-
-        TmpCab = self._client.convert_from_registers(regs[31:32], data_type = self._client.DATATYPE.INT16)
-        Tmp_SF = self._client.convert_from_registers(regs[35:36], data_type = self._client.DATATYPE.INT16)
-        #St = self._client.convert_from_registers(regs[36:37], data_type = self._client.DATATYPE.UINT16)
-        StVnd = self._client.convert_from_registers(regs[37:38], data_type = self._client.DATATYPE.UINT16)
-        #EvtVnd1 = self._client.convert_from_registers(regs[42:44], data_type = self._client.DATATYPE.UINT32)
-        EvtVnd2 = self._client.convert_from_registers(regs[44:46], data_type = self._client.DATATYPE.UINT32)
-
-        self.data['PPVphAB'] = self.calculate_value(PPVphAB, V_SF)
-        self.data['PPVphBC'] = self.calculate_value(PPVphBC, V_SF)
-        self.data['PPVphCA'] = self.calculate_value(PPVphCA, V_SF)
-        self.data['PhVphA'] = self.calculate_value(PhVphA, V_SF)
-        self.data['PhVphB'] = self.calculate_value(PhVphB, V_SF)
-        self.data['PhVphC'] = self.calculate_value(PhVphC, V_SF)
-        self.data['tempcab'] = self.calculate_value(TmpCab, Tmp_SF)
-        self.data["acpower"] = self.calculate_value(W, W_SF, 2, -50000, 50000)
-        self.data["line_frequency"] = self.calculate_value(Hz, Hz_SF, 2, 0, 100)
-        self.data["acenergy"] = self.calculate_value(WH, WH_SF) 
-        #self.data["status"] = INVERTER_STATUS[St]
-        self.data["statusvendor"] = FRONIUS_INVERTER_STATUS[StVnd]
-        self.data["statusvendor_id"] = StVnd
-        #self.data["events1"] = self.bitmask_to_string(EvtVnd1,INVERTER_EVENTS,default='None',bits=32)  
-        self.data["events2"] = self.bitmask_to_string(EvtVnd2,INVERTER_EVENTS,default='None',bits=32)  
+        (PPVphAB, PPVphBC, PPVphCA, PhVphA, PhVphB, PhVphC, V_SF,
+         W, W_SF, Hz, Hz_SF, WH, WH_SF, TmpCab, Tmp_SF, StVnd, EvtVnd2) = _INVERTER_STRUCT.unpack_from(buf)
+
+        self.data.update({
+            'PPVphAB': self.calculate_value(PPVphAB, V_SF),
+            'PPVphBC': self.calculate_value(PPVphBC, V_SF),
+            'PPVphCA': self.calculate_value(PPVphCA, V_SF),
+            'PhVphA': self.calculate_value(PhVphA, V_SF),
+            'PhVphB': self.calculate_value(PhVphB, V_SF),
+            'PhVphC': self.calculate_value(PhVphC, V_SF),
+            'tempcab': self.calculate_value(TmpCab, Tmp_SF),
+            'acpower': self.calculate_value(W, W_SF, 2, -50000, 50000),
+            'line_frequency': self.calculate_value(Hz, Hz_SF, 2, 0, 100),
+            'acenergy': self.calculate_value(WH, WH_SF),
+            #'status': INVERTER_STATUS[St],
+            'statusvendor': self.get_value_from_list(FRONIUS_INVERTER_STATUS, StVnd),
+            'statusvendor_id': StVnd,
+            #'events1': self.bitmask_to_string(EvtVnd1,INVERTER_EVENTS,default='None',bits=32),
+            'events2': self.bitmask_to_string(EvtVnd2,INVERTER_EVENTS,default='None',bits=32),
+        })
 
         return True
 
@@ -216,13 +334,10 @@ class FroniusModbusClient(ExtModbusClient):
             return False
 
         # DERTyp: Type of DER device. Default value is 4 to indicate PV device.
-        DERTyp = self._client.convert_from_registers(regs[0:1], data_type = self._client.DATATYPE.UINT16)
         # WHRtg: Nominal energy rating of storage device.
-        WHRtg = self._client.convert_from_registers(regs[17:18], data_type = self._client.DATATYPE.UINT16)
         # MaxChaRte: Maximum rate of energy transfer into the storage device.
-        MaxChaRte = self._client.convert_from_registers(regs[21:22], data_type = self._client.DATATYPE.UINT16)
         # MaxDisChaRte: Maximum rate of energy transfer out of the storage device.
-        MaxDisChaRte = self._client.convert_from_registers(regs[23:24], data_type = self._client.DATATYPE.UINT16)
+        DERTyp, WHRtg, MaxChaRte, MaxDisChaRte = _NAMEPLATE_STRUCT.unpack_from(self.registers_to_bytes(regs))
 
         if DERTyp == 82:
             self.storage_configured = True
@@ -236,35 +351,28 @@ class FroniusModbusClient(ExtModbusClient):
         return True
 
     async def read_inverter_status_data(self):
-        regs = await self.get_registers(unit_id=self._inverter_unit_id, address=40183, count=44)
-        if regs is None:
+        buf = await self.get_inverter_buffer(INVERTER_STATUS_SPAN)
+        if buf is None:
             return False
 
-        PVConn = self._client.convert_from_registers(regs[0:1], data_type = self._client.DATATYPE.UINT16)
-        StorConn = self._client.convert_from_registers(regs[1:2], data_type = self._client.DATATYPE.UINT16)
-        ECPConn = self._client.convert_from_registers(regs[2:3], data_type = self._client.DATATYPE.UINT16)
+        PVConn, StorConn, ECPConn, StActCtl = _STATUS_STRUCT.unpack_from(buf)
 
-        StActCtl = self._client.convert_from_registers(regs[33:35], data_type = self._client.DATATYPE.UINT32)
-        
-        self.data['pv_connection'] = CONNECTION_STATUS_CONDENSED[PVConn]
-        self.data['storage_connection'] = CONNECTION_STATUS_CONDENSED[StorConn] 
-        self.data['ecp_connection'] = ECP_CONNECTION_STATUS[ECPConn]
-        self.data['inverter_controls'] = self.bitmask_to_string(StActCtl, INVERTER_CONTROLS, 'Normal')  
+        self.data.update({
+            'pv_connection': self.get_value_from_list(CONNECTION_STATUS_CONDENSED, PVConn),
+            'storage_connection': self.get_value_from_list(CONNECTION_STATUS_CONDENSED, StorConn),
+            'ecp_connection': self.get_value_from_list(ECP_CONNECTION_STATUS, ECPConn),
+            'inverter_controls': self.bitmask_to_string(StActCtl, INVERTER_CONTROLS, 'Normal'),
+        })
 
         return True
 
     async def read_inverter_model_settings_data(self):
-        regs = await self.get_registers(unit_id=self._inverter_unit_id, address=40151, count=30)
-        if regs is None:
+        buf = await self.get_inverter_buffer(MODEL_SETTINGS_SPAN)
+        if buf is None:
             return False
 
-        WMax = self._client.convert_from_registers(regs[0:1], data_type = self._client.DATATYPE.UINT16)
-        #VRef = self._client.convert_from_registers(regs[1:2], data_type = self._client.DATATYPE.UINT16)
-        #VRefOfs = self._client.convert_from_registers(regs[2:3], data_type = self._client.DATATYPE.UINT16)
-
-        WMax_SF = self._client.convert_from_registers(regs[20:21], data_type = self._client.DATATYPE.INT16)
-        #VRef_SF = self._client.convert_from_registers(regs[21:22], data_type = self._client.DATATYPE.INT16)
-        #VRefOfs_SF = self._client.convert_from_registers(regs[21:22], data_type = self._client.DATATYPE.INT16)
+        WMax, WMax_SF = _MODEL_SETTINGS_STRUCT.unpack_from(buf)
+        #VRef = regs[1], VRefOfs = regs[2], VRef_SF = VRefOfs_SF = regs[21] (int16)
 
         self.data['max_power'] = self.calculate_value(WMax, WMax_SF,2,0,50000) 
         #self.data['vref'] = self.calculate_value(VRef, VRef_SF) # At PCC 
@@ -273,139 +381,115 @@ class FroniusModbusClient(ExtModbusClient):
         return True
 
     async def read_inverter_controls_data(self):
-        regs = await self.get_registers(unit_id=self._inverter_unit_id, address=40229, count=24)
-        if regs is None:
+        buf = await self.get_inverter_buffer(INVERTER_CONTROLS_SPAN)
+        if buf is None:
             return False
 
-        Conn = self._client.convert_from_registers(regs[2:3], data_type = self._client.DATATYPE.UINT16)
-        WMaxLim_Ena = self._client.convert_from_registers(regs[7:8], data_type = self._client.DATATYPE.UINT16)
-        OutPFSet_Ena = self._client.convert_from_registers(regs[12:13], data_type = self._client.DATATYPE.UINT16)
-        VArPct_Ena = self._client.convert_from_registers(regs[20:21], data_type = self._client.DATATYPE.INT16)
+        Conn, WMaxLim_Ena, OutPFSet_Ena, VArPct_Ena = _CONTROLS_STRUCT.unpack_from(buf)
 
-        self.data['Conn'] = CONTROL_STATUS[Conn]
-        self.data['WMaxLim_Ena'] = CONTROL_STATUS[WMaxLim_Ena]
-        self.data['OutPFSet_Ena'] = CONTROL_STATUS[OutPFSet_Ena]
-        self.data['VArPct_Ena'] = CONTROL_STATUS[VArPct_Ena]
+        self.data['Conn'] = self.get_value_from_list(CONTROL_STATUS, Conn)
+        self.data['WMaxLim_Ena'] = self.get_value_from_list(CONTROL_STATUS, WMaxLim_Ena)
+        self.data['OutPFSet_Ena'] = self.get_value_from_list(CONTROL_STATUS, OutPFSet_Ena)
+        self.data['VArPct_Ena'] = self.get_value_from_list(CONTROL_STATUS, VArPct_Ena)
 
         return True
 
     async def read_mppt_data(self):
-        regs = await self.get_registers(unit_id=self._inverter_unit_id, address=MPPT_ADDRESS, count=88)
-        if regs is None:
+        buf = await self.get_inverter_buffer(MPPT_SPAN)
+        if buf is None:
             return False
 
-        DCW_SF = self._client.convert_from_registers(regs[2:3], data_type = self._client.DATATYPE.INT16)
-        DCWH_SF = self._client.convert_from_registers(regs[3:4], data_type = self._client.DATATYPE.INT16)
-        #N = self._client.convert_from_registers(regs[6:7], data_type = self._client.DATATYPE.UINT16)
+        (DCW_SF, DCWH_SF,
+         module_1_DCW, module_1_DCWH, module_2_DCW, module_2_DCWH,
+         module_3_DCW, module_3_DCWH, module_4_DCW, module_4_DCWH) = _MPPT_STRUCT.unpack_from(buf)
+        #N = regs[6]
         # if N != 4:
         #     _LOGGER.error(f"Integration only supports 4 mppt modules. Found only: {N}")
         #     return
 
-        module_1_DCW = self._client.convert_from_registers(regs[19:20], data_type = self._client.DATATYPE.UINT16)
-        module_1_DCWH = self._client.convert_from_registers(regs[20:22], data_type = self._client.DATATYPE.UINT32)
-
-        module_2_DCW = self._client.convert_from_registers(regs[39:40], data_type = self._client.DATATYPE.UINT16)
-        module_2_DCWH = self._client.convert_from_registers(regs[40:42], data_type = self._client.DATATYPE.UINT32)
-
-        mppt1_power = self.calculate_value(module_1_DCW, DCW_SF, 2, 0, 15000)
-        mppt2_power = self.calculate_value(module_2_DCW, DCW_SF, 2, 0, 15000)
+        mppt1_power, mppt2_power = self.calculate_values((module_1_DCW, module_2_DCW), DCW_SF, 2, 0, 15000)
         if not mppt1_power is None and not mppt2_power is None:
              pv_power = mppt1_power + mppt2_power
         else:
             pv_power = None
 
-        mppt1_lfte = self.calculate_value(module_1_DCWH, DCWH_SF)
-        mppt2_lfte = self.calculate_value(module_2_DCWH, DCWH_SF)
+        mppt1_lfte, mppt2_lfte = self.calculate_values((module_1_DCWH, module_2_DCWH), DCWH_SF)
 
-        self.data['mppt1_power'] = mppt1_power
-        self.data['mppt2_power'] = mppt2_power
-        self.data['pv_power'] = pv_power
-        self.data['mppt1_lfte'] = mppt1_lfte
-        self.data['mppt2_lfte'] = mppt2_lfte
+        self.data.update({
+            'mppt1_power': mppt1_power,
+            'mppt2_power': mppt2_power,
+            'pv_power': pv_power,
+            'mppt1_lfte': mppt1_lfte,
+            'mppt2_lfte': mppt2_lfte,
+        })
 
         if self.storage_configured:
-            module_3_DCW = self._client.convert_from_registers(regs[59:60], data_type = self._client.DATATYPE.UINT16)
-            module_3_DCWH = self._client.convert_from_registers(regs[60:62], data_type = self._client.DATATYPE.UINT32)
-
-            module_4_DCW = self._client.convert_from_registers(regs[79:80], data_type = self._client.DATATYPE.UINT16)
-            module_4_DCWH = self._client.convert_from_registers(regs[80:82], data_type = self._client.DATATYPE.UINT32)
-
-            mppt3_power = self.calculate_value(module_3_DCW, DCW_SF, 2, 0, 15000)
-            mppt4_power = self.calculate_value(module_4_DCW, DCW_SF, 2, 0, 15000)
+            mppt3_power, mppt4_power = self.calculate_values((module_3_DCW, module_4_DCW), DCW_SF, 2, 0, 15000)
             if not mppt3_power is None and not mppt4_power is None:
                 storage_power = mppt4_power - mppt3_power
             else:
                 storage_power = None
         
-            mppt3_lfte = self.calculate_value(module_3_DCWH, DCWH_SF)
-            mppt4_lfte = self.calculate_value(module_4_DCWH, DCWH_SF)
+            mppt3_lfte, mppt4_lfte = self.calculate_values((module_3_DCWH, module_4_DCWH), DCWH_SF)
 
-            self.data['mppt3_power'] = mppt3_power
-            self.data['mppt4_power'] = mppt4_power
-            self.data['storage_power'] = storage_power
-
-            self.data['mppt3_lfte'] = mppt3_lfte
-            self.data['mppt4_lfte'] = mppt4_lfte
+            self.data.update({
+                'mppt3_power': mppt3_power,
+                'mppt4_power': mppt4_power,
+                'storage_power': storage_power,
+                'mppt3_lfte': mppt3_lfte,
+                'mppt4_lfte': mppt4_lfte,
+            })
 
         return True
 
     async def read_inverter_storage_data(self):
         """start reading storage data"""
-        regs = await self.get_registers(unit_id=self._inverter_unit_id, address=STORAGE_ADDRESS, count=24)
-        if regs is None:
+        buf = await self.get_inverter_buffer(STORAGE_SPAN)
+        if buf is None:
             return False
         
         # WChaMax: Reference Value for maximum Charge and Discharge.
-        max_charge = self._client.convert_from_registers(regs[0:1], data_type = self._client.DATATYPE.UINT16)
         # WChaGra: Setpoint for maximum charging rate. Default is MaxChaRte.
-        WChaGra = self._client.convert_from_registers(regs[1:2], data_type = self._client.DATATYPE.UINT16)
         # WDisChaGra: Setpoint for maximum discharge rate. Default is MaxDisChaRte.
-        WDisChaGra = self._client.convert_from_registers(regs[2:3], data_type = self._client.DATATYPE.UINT16)
         # StorCtl_Mod: Active hold/discharge/charge storage control mode.
-        storage_control_mode = self._client.convert_from_registers(regs[3:4], data_type = self._client.DATATYPE.UINT16)
         # VAChaMax: not supported
         # MinRsvPct: Setpoint for minimum reserve for storage as a percentage of the nominal maximum storage.
-        minimum_reserve = self._client.convert_from_registers(regs[5:6], data_type = self._client.DATATYPE.UINT16)
         # ChaState: Currently available energy as a percent of the capacity rating.
-        charge_state = self._client.convert_from_registers(regs[6:7], data_type = self._client.DATATYPE.UINT16)
         # StorAval: not supported 
         # InBatV: not supported
         # ChaSt:  Charge status of storage device.
-        charge_status = self._client.convert_from_registers(regs[9:10], data_type = self._client.DATATYPE.UINT16)
         # OutWRte: Defines maximum Discharge rate. If not used than the default is 100 and WChaMax defines max. Discharge rate.
-        discharge_power = self._client.convert_from_registers(regs[10:11], data_type = self._client.DATATYPE.INT16)
         # InWRte: Defines maximum Charge rate. If not used than the default is 100 and WChaMax defines max. Charge rate.
-        charge_power = self._client.convert_from_registers(regs[11:12], data_type = self._client.DATATYPE.INT16)
         # InOutWRte_WinTms: not supported
         # InOutWRte_RvrtTms: Timeout period for charge/discharge rate.
-        #InOutWRte_RvrtTms = self._client.convert_from_registers(regs[13:14], data_type = self._client.DATATYPE.INT16)
         # InOutWRte_RmpTms: not supported
         # ChaGriSet
-        charge_grid_set = self._client.convert_from_registers(regs[15:16], data_type = self._client.DATATYPE.UINT16)
         # WChaMax_SF: Scale factor for maximum charge. 0
-        #max_charge_sf = self._client.convert_from_registers(regs[16:17], data_type = self._client.DATATYPE.INT16)
         # WChaDisChaGra_SF: Scale factor for maximum charge and discharge rate. 0
         # VAChaMax_SF: not supported
         # MinRsvPct_SF: Scale factor for minimum reserve percentage. -2
         # ChaState_SF: Scale factor for available energy percent. -2
-        #charge_state_sf = self._client.convert_from_registers(regs[20:21], data_type = self._client.DATATYPE.INT16)
         # StorAval_SF: not supported
         # InBatV_SF: not supported
         # InOutWRte_SF: Scale factor for percent charge/discharge rate. -2
-
-        self.data['grid_charging'] = CHARGE_GRID_STATUS.get(charge_grid_set)
-        #self.data['power'] = power
-        self.data['charge_status'] = CHARGE_STATUS.get(charge_status)
-        self.data['minimum_reserve'] =  self.calculate_value(minimum_reserve, -2, 2, 0, 100)
-        self.data['discharging_power'] = self.calculate_value(discharge_power, -2, 2, -100, 100)
-        self.data['charging_power'] = self.calculate_value(charge_power, -2, 2, -100, 100)
-        self.data['soc'] = self.calculate_value(charge_state, -2, 2, 0, 100)
-        self.data['max_charge'] = self.calculate_value(max_charge, 0, 0)
-        self.data['WChaGra'] = self.calculate_value(WChaGra, 0, 0)
-        self.data['WDisChaGra'] = self.calculate_value(WDisChaGra, 0, 0)
+        (max_charge, WChaGra, WDisChaGra, storage_control_mode, minimum_reserve, charge_state,
+         charge_status, discharge_power, charge_power, charge_grid_set) = _STORAGE_STRUCT.unpack_from(buf)
+
+        self.data.update({
+            'grid_charging': self.get_value_from_list(CHARGE_GRID_STATUS, charge_grid_set),
+            #'power': power,
+            'charge_status': self.get_value_from_list(CHARGE_STATUS, charge_status),
+            'minimum_reserve': self.calculate_value(minimum_reserve, -2, 2, 0, 100),
+            'discharging_power': self.calculate_value(discharge_power, -2, 2, -100, 100),
+            'charging_power': self.calculate_value(charge_power, -2, 2, -100, 100),
+            'soc': self.calculate_value(charge_state, -2, 2, 0, 100),
+            'max_charge': self.calculate_value(max_charge, 0, 0),
+            'WChaGra': self.calculate_value(WChaGra, 0, 0),
+            'WDisChaGra': self.calculate_value(WDisChaGra, 0, 0),
+        })
 
         control_mode = self.data.get('control_mode')
-        if control_mode is None or control_mode != STORAGE_CONTROL_MODE.get(storage_control_mode):
+        if control_mode is None or control_mode != self.get_value_from_list(STORAGE_CONTROL_MODE, storage_control_mode):
             if discharge_power >= 0:
                 self.data['discharge_limit'] = discharge_power / 100.0 
                 self.data['grid_charge_power'] = 0
@@ -419,27 +503,12 @@ class FroniusModbusClient(ExtModbusClient):
                 self.data['grid_discharge_power'] = (charge_power * -1) / 100.0 
                 self.data['charge_limit'] = 0
 
-            self.data['control_mode'] = STORAGE_CONTROL_MODE.get(storage_control_mode)
+            self.data['control_mode'] = self.get_value_from_list(STORAGE_CONTROL_MODE, storage_control_mode)
 
         # set extended storage control mode at startup
         ext_control_mode = self.data.get('ext_control_mode')
         if ext_control_mode is None:
-            if storage_control_mode == 0:
-                ext_control_mode = 0
-            elif storage_control_mode in [1,3] and charge_power == 0:
-                ext_control_mode = 7
-            elif storage_control_mode == 1:
-                ext_control_mode = 1
-            elif storage_control_mode in [2,3] and discharge_power < 0:
-                ext_control_mode = 4
-            elif storage_control_mode in [2,3] and charge_power < 0:
-                ext_control_mode = 5
-            elif storage_control_mode in [2,3] and discharge_power == 0:
-                ext_control_mode = 6
-            elif storage_control_mode == 2:
-                ext_control_mode = 2
-            elif storage_control_mode == 3:
-                ext_control_mode = 3
+            ext_control_mode = _EXT_CONTROL_MODE_TABLE[(storage_control_mode, _sign(charge_power), _sign(discharge_power))]
             self.data['ext_control_mode'] = STORAGE_EXT_CONTROL_MODE[ext_control_mode]
             self.storage_extended_control_mode = ext_control_mode
 
@@ -457,74 +526,92 @@ class FroniusModbusClient(ExtModbusClient):
 
         return True
 
+    async def read_meter_blocks(self):
+        """Read the register blocks of all meters, skip meters that failed recently."""
+        self._meters_read = ()
+        meters_read = []
+        # one at a time, the meters share the connection and a concurrent reconnect would open a second session
+        for unit_id in self._meter_unit_ids:
+            if self._meter_skip[unit_id] > 0:
+                self._meter_skip[unit_id] -= 1
+                continue
+            try:
+                result = await self.read_blocks(unit_id=unit_id, spans=[METER_SPAN])
+            except Exception as e:
+                _LOGGER.error(f"Error reading meter {unit_id} register block.", exc_info=True)
+                result = False
+            if result:
+                self._meter_backoff[unit_id] = 0
+                meters_read.append(unit_id)
+                continue
+            self.clear_register_cache(unit_id)
+            # unreachable meter, skip it for the next refreshes instead of waiting for timeouts
+            backoff = min(self._meter_backoff[unit_id] * 2 + 1, METER_MAX_BACKOFF_CYCLES)
+            self._meter_backoff[unit_id] = backoff
+            self._meter_skip[unit_id] = backoff
+            _LOGGER.debug(f"meter {unit_id} not read, skipping {backoff} refreshes")
+        self._meters_read = meters_read
+        return len(meters_read) > 0
+
     async def read_meter_data(self, meter_prefix, unit_id):
         """start reading meter data"""
-        regs = await self.get_registers(unit_id=unit_id, address=METER_ADDRESS, count=103)
-        if regs is None:
+        buf = await self.get_cached_buffer(unit_id, *METER_SPAN)
+        if buf is None:
             return False
 
-        PhVphA = self._client.convert_from_registers(regs[6:7], data_type = self._client.DATATYPE.INT16)
-        PhVphB = self._client.convert_from_registers(regs[7:8], data_type = self._client.DATATYPE.INT16)
-        PhVphC = self._client.convert_from_registers(regs[8:9], data_type = self._client.DATATYPE.INT16)
-        PPV = self._client.convert_from_registers(regs[9:10], data_type = self._client.DATATYPE.INT16)
-        V_SF = self._client.convert_from_registers(regs[13:14], data_type = self._client.DATATYPE.INT16)
-
-        Hz = self._client.convert_from_registers(regs[14:15], data_type = self._client.DATATYPE.INT16)
-        Hz_SF = self._client.convert_from_registers(regs[15:16], data_type = self._client.DATATYPE.INT16)
-        W = self._client.convert_from_registers(regs[16:17], data_type = self._client.DATATYPE.INT16)
-        W_SF = self._client.convert_from_registers(regs[20:21], data_type = self._client.DATATYPE.INT16)
-
-        TotWhExp = self._client.convert_from_registers(regs[36:38], data_type = self._client.DATATYPE.UINT32)
-        TotWhImp = self._client.convert_from_registers(regs[44:46], data_type = self._client.DATATYPE.UINT32)
-        TotWh_SF = self._client.convert_from_registers(regs[52:53], data_type = self._client.DATATYPE.INT16)
+        (PhVphA, PhVphB, PhVphC, PPV, V_SF,
+         Hz, Hz_SF, W, W_SF, TotWhExp, TotWhImp, TotWh_SF) = _METER_STRUCT.unpack_from(buf)
 
         acpower = self.calculate_value(W, W_SF, 2, -50000, 50000)
         m_frequency = self.calculate_value(Hz, Hz_SF, 2, 0, 100)
  
-        self.data[meter_prefix + "PhVphA"] = self.calculate_value(PhVphA, V_SF,1,0,1000)
-        self.data[meter_prefix + "PhVphB"] = self.calculate_value(PhVphB, V_SF,1,0,1000)
-        self.data[meter_prefix + "PhVphC"] = self.calculate_value(PhVphC, V_SF,1,0,1000)
-        self.data[meter_prefix + "PPV"] = self.calculate_value(PPV, V_SF,1,0,1000)
-        self.data[meter_prefix + "exported"] = self.calculate_value(TotWhExp, TotWh_SF)
-        self.data[meter_prefix + "imported"] = self.calculate_value(TotWhImp, TotWh_SF)
+        (self.data[meter_prefix + "PhVphA"], self.data[meter_prefix + "PhVphB"],
+         self.data[meter_prefix + "PhVphC"], self.data[meter_prefix + "PPV"]) = self.calculate_values((PhVphA, PhVphB, PhVphC, PPV), V_SF,1,0,1000)
+        self.data[meter_prefix + "exported"], self.data[meter_prefix + "imported"] = self.calculate_values((TotWhExp, TotWhImp), TotWh_SF)
         self.data[meter_prefix + "line_frequency"] = m_frequency
         self.data[meter_prefix + "power"] = acpower
 
         if meter_prefix == 'm1_':
-            inverter_acpower = self.data.get('acpower')
+            data = self.data
+            inverter_acpower = data.get('acpower')
+            i_frequency = data.get('line_frequency')
+
             if not acpower is None and not inverter_acpower is None:
-                if self.is_numeric(acpower) and self.is_numeric(inverter_acpower):
-                    self.data['load'] = round(acpower + inverter_acpower,2)
-                elif not self.is_numeric(acpower):
+                acpower_numeric = self.is_numeric(acpower)
+                inverter_acpower_numeric = self.is_numeric(inverter_acpower)
+                if acpower_numeric and inverter_acpower_numeric:
+                    data['load'] = round(acpower + inverter_acpower,2)
+                elif not acpower_numeric:
                     _LOGGER.error(f'meter {meter_prefix} acpower not numeric {acpower}')
-                elif not self.is_numeric(inverter_acpower):
+                else:
                     _LOGGER.error(f'inverter acpower not numeric {inverter_acpower}')
 
             status_str = ""
-            i_frequency = self.data["line_frequency"]
             #_LOGGER.debug(f'grid status m: {m_frequency} i: {i_frequency}')
-            if not i_frequency is None and self.is_numeric(i_frequency) and not m_frequency is None and self.is_numeric(m_frequency):
-                m_online = False
-                if m_frequency and m_frequency > self._grid_frequency_lower_bound and m_frequency < self._grid_frequency_upper_bound:
-                    m_online = True
-                
-                if m_online and i_frequency > self._grid_frequency_lower_bound and i_frequency < self._grid_frequency_upper_bound:
-                    status_str = GRID_STATUS.get(3)
-                elif not m_online and i_frequency > self._inverter_frequency_lower_bound and i_frequency < self._inverter_frequency_upper_bound:
-                    status_str = GRID_STATUS.get(1)
-                elif i_frequency < 1:
-                    if m_online:
-                        status_str = GRID_STATUS.get(2)
-                    elif m_frequency < 1:
-                        status_str = GRID_STATUS.get(0)
+            # is_numeric also rejects None
+            if self.is_numeric(i_frequency) and self.is_numeric(m_frequency):
+                status_str = self.get_grid_status(m_frequency, i_frequency)
             if status_str is None:
                 _LOGGER.error(f'Could not establish grid connection status m: {m_frequency} i: {i_frequency}')
-                self.data["grid_status"] = None
+                data["grid_status"] = None
             else:
-                self.data["grid_status"] = status_str
+                data["grid_status"] = status_str
 
         return True
 
+    def get_grid_status(self, m_frequency, i_frequency):
+        lower = self._grid_frequency_lower_bound
+        upper = self._grid_frequency_upper_bound
+        key = ((lower < m_frequency < upper) << 4
+            | (lower < i_frequency < upper) << 3
+            | (self._inverter_frequency_lower_bound < i_frequency < self._inverter_frequency_upper_bound) << 2
+            | (i_frequency < 1) << 1
+            | (m_frequency < 1))
+        index = _GRID_STATUS_TABLE[key]
+        if index is None:
+            return ""
+        return GRID_STATUS[index]
+
     async def set_storage_control_mode(self, mode: int):
         if not mode in [0,1,2,3]:
             _LOGGER.error(f'Attempted to set to unsupported storage control mode. Value: {mode}')
@@ -539,29 +626,13 @@ class FroniusModbusClient(ExtModbusClient):
         await self.write_registers(unit_id=self._inverter_unit_id, address=MINIMUM_RESERVE_ADDRESS, payload=[minimum_reserve])
 
     async def set_discharge_rate_w(self, discharge_rate_w):
-        if discharge_rate_w > self.max_discharge_rate_w:
-            discharge_rate = 100
-        elif discharge_rate_w < self.max_discharge_rate_w * -1:
-            discharge_rate = -100
-        else:
-            discharge_rate = discharge_rate_w / self.max_discharge_rate_w * 100
-        await self.set_discharge_rate(discharge_rate)
+        await self.set_discharge_rate(_clamp_rate(discharge_rate_w, self.max_discharge_rate_w))
 
     async def set_discharge_rate(self, discharge_rate):
-        if discharge_rate < 0:
-            discharge_rate = int(65536 + (discharge_rate * 100))
-        else:
-            discharge_rate = int(round(discharge_rate * 100))
-        await self.write_registers(unit_id=self._inverter_unit_id, address=DISCHARGE_RATE_ADDRESS, payload=[discharge_rate])
+        await self.write_registers(unit_id=self._inverter_unit_id, address=DISCHARGE_RATE_ADDRESS, payload=[_to_u16_scaled(discharge_rate)])
 
     async def set_charge_rate_w(self, charge_rate_w):
-        if charge_rate_w > self.max_charge_rate_w:
-            charge_rate = 100
-        elif charge_rate_w < self.max_charge_rate_w * -1:
-            charge_rate = -100
-        else:
-            charge_rate = charge_rate_w / self.max_charge_rate_w * 100
-        await self.set_charge_rate(charge_rate)
+        await self.set_charge_rate(_clamp_rate(charge_rate_w, self.max_charge_rate_w))
 
     async def set_grid_charge_power(self, value):
         if self.storage_extended_control_mode == 4:
@@ -598,25 +669,17 @@ class FroniusModbusClient(ExtModbusClient):
             return
 
     async def set_charge_rate(self, charge_rate):
-        if charge_rate < 0:
-            charge_rate =  int(65536 + (charge_rate * 100))
-        else:
-            charge_rate = int(round(charge_rate * 100))
-        await self.write_registers(unit_id=self._inverter_unit_id, address=CHARGE_RATE_ADDRESS, payload=[charge_rate])
+        await self.write_registers(unit_id=self._inverter_unit_id, address=CHARGE_RATE_ADDRESS, payload=[_to_u16_scaled(charge_rate)])
+
+    async def set_charge_discharge_rates(self, charge_rate, discharge_rate):
+        # OutWRte and InWRte are adjacent registers, write both in one request
+        await self.write_registers(unit_id=self._inverter_unit_id, address=DISCHARGE_RATE_ADDRESS, payload=[_to_u16_scaled(discharge_rate), _to_u16_scaled(charge_rate)])
 
     async def change_settings(self, mode, charge_limit, discharge_limit, grid_charge_power=0, grid_discharge_power=0, minimum_reserve=None):
         await self.set_storage_control_mode(mode)
-        await self.set_charge_rate(charge_limit)
-        await self.set_discharge_rate(discharge_limit)
-        self.data['charge_limit'] = charge_limit
-        if self.storage_extended_control_mode == 4:
-            self.data['discharge_limit'] = 0
-        else:
-            self.data['discharge_limit'] = discharge_limit
-        if self.storage_extended_control_mode == 5:
-            self.data['charge_limit'] = 0
-        else:
-            self.data['charge_limit'] = charge_limit
+        await self.set_charge_discharge_rates(charge_limit, discharge_limit)
+        self.data['charge_limit'] = 0 if self.storage_extended_control_mode == 5 else charge_limit
+        self.data['discharge_limit'] = 0 if self.storage_extended_control_mode == 4 else discharge_limit
         self.data['grid_charge_power'] = grid_charge_power
         self.data['grid_discharge_power'] = grid_discharge_power
         if not minimum_reserve is None:
@@ -4,6 +4,9 @@ SUPPORTED_MODELS = ['Primo GEN24', 'Symo GEN24']
 COMMON_ADDRESS = 40004
 INVERTER_ADDRESS = 40071
 NAMEPLATE_ADDRESS = 40123
+MODEL_SETTINGS_ADDRESS = 40151
+INVERTER_STATUS_ADDRESS = 40183
+INVERTER_CONTROLS_ADDRESS = 40229
 MPPT_ADDRESS = 40255
 METER_ADDRESS = 40071
 STORAGE_ADDRESS = 40345
@@ -12,38 +15,60 @@ MINIMUM_RESERVE_ADDRESS = 40350
 DISCHARGE_RATE_ADDRESS = 40355
 CHARGE_RATE_ADDRESS = 40356
 
+# (address, count) of the inverter register blocks read on refresh
+INVERTER_SPAN = (INVERTER_ADDRESS, 50)
+MODEL_SETTINGS_SPAN = (MODEL_SETTINGS_ADDRESS, 30)
+INVERTER_STATUS_SPAN = (INVERTER_STATUS_ADDRESS, 44)
+INVERTER_CONTROLS_SPAN = (INVERTER_CONTROLS_ADDRESS, 24)
+MPPT_SPAN = (MPPT_ADDRESS, 88)
+STORAGE_SPAN = (STORAGE_ADDRESS, 24)
+METER_SPAN = (METER_ADDRESS, 103)
+
+# modbus allows 125 registers per read, stay a little below
+MAX_REGISTERS_PER_REQUEST = 122
+
+# refreshes a meter is skipped after failed reads, doubles per failure up to this
+METER_MAX_BACKOFF_CYCLES = 10
+
     # Manufacturer
     # Type
     # Firmware
     # Serial
 
-STORAGE_CONTROL_MODE = {
-    0: 'Auto',
-    1: 'Charge',
-    2: 'Discharge',
-    3: 'Change and Discharge',
-}
-
-CHARGE_STATUS = {
-    1: 'Off',
-    2: 'Empty',
-    3: 'Discharging',
-    4: 'Charging',
-    5: 'Full',
-    6: 'Holding',
-    7: 'Testing',
-}
-
-INVERTER_STATUS = {
-    1: 'Off',
-    2: 'Sleeping',
-    3: 'Starting',
-    4: 'Normal',
-    5: 'Throttled',
-    6: 'Shutdown',
-    7: 'Fault',
-    8: 'Standby',
-}
+# status lookups are tuples indexed by register value, None marks unused values
+
+STORAGE_CONTROL_MODE = (
+    'Auto',
+    'Charge',
+    'Discharge',
+    'Change and Discharge',
+)
+
+CHARGE_STATUS = (
+    None,
+    'Off',
+    'Empty',
+    'Discharging',
+    'Charging',
+    'Full',
+    'Holding',
+    'Testing',
+)
+
+INVERTER_STATUS = (
+    None,
+    'Off',
+    'Sleeping',
+    'Starting',
+    'Normal',
+    'Throttled',
+    'Shutdown',
+    'Fault',
+    'Standby',
+)
+
+# Off, Sleeping
+INVERTER_IDLE_STATUS = (1, 2)
 
 INVERTER_CONTROLS = [
     'Power reduction',
@@ -57,33 +82,35 @@ INVERTER_EVENTS = [
     'Info',
 ]
 
-FRONIUS_INVERTER_STATUS = {
-    1: 'Off',
-    2: 'Sleeping',
-    3: 'Starting',
-    4: 'Normal',
-    5: 'Throttled',
-    6: 'Shutdown',
-    7: 'Fault',
-    8: 'Standby',
-    9: 'No solarnet',
-    10: 'No inverter communication',
-    11: 'Overcurrent solarnet',
-    12: 'Firmware updating',
-    13: 'ACFI event',
-}
-
-CHARGE_GRID_STATUS = {
-    1: 'Disabled',
-    2: 'Enabled',
-}
-
-GRID_STATUS = {
-    0: 'Off grid',
-    1: 'Off grid operating',
-    2: 'On grid',
-    3: 'On grid operating',
-}
+FRONIUS_INVERTER_STATUS = (
+    None,
+    'Off',
+    'Sleeping',
+    'Starting',
+    'Normal',
+    'Throttled',
+    'Shutdown',
+    'Fault',
+    'Standby',
+    'No solarnet',
+    'No inverter communication',
+    'Overcurrent solarnet',
+    'Firmware updating',
+    'ACFI event',
+)
+
+CHARGE_GRID_STATUS = (
+    None,
+    'Disabled',
+    'Enabled',
+)
+
+GRID_STATUS = (
+    'Off grid',
+    'Off grid operating',
+    'On grid',
+    'On grid operating',
+)
 
 CONNECTION_STATUS = [ 
     'Connected',
@@ -91,31 +118,35 @@ CONNECTION_STATUS = [
     'Operating',
 ]
 
-CONNECTION_STATUS_CONDENSED = {
-    0: 'Disconnected',
-    1: 'Connected', 
-    3: 'Available', 
-    7: 'Operating', 
-}
-
-ECP_CONNECTION_STATUS = {
-    0: 'Disconnected',
-    1: 'Connected',
-}
-
-CONTROL_STATUS = {
-    0: 'Disabled',
-    1: 'Enabled',
-}
-
-STORAGE_EXT_CONTROL_MODE = {
-    0: 'Auto',
-    1: 'PV Charge Limit',
-    2: 'Discharge Limit',
-    3: 'PV Charge and Discharge Limit',
-    4: 'Charge from Grid',
-    5: 'Discharge to Grid',
-    6: 'Block Discharging',
-    7: 'Block Charging',
-#    8: 'Calibrate',
-}
+CONNECTION_STATUS_CONDENSED = (
+    'Disconnected',
+    'Connected', 
+    None,
+    'Available', 
+    None,
+    None,
+    None,
+    'Operating', 
+)
+
+ECP_CONNECTION_STATUS = (
+    'Disconnected',
+    'Connected',
+)
+
+CONTROL_STATUS = (
+    'Disabled',
+    'Enabled',
+)
+
+STORAGE_EXT_CONTROL_MODE = (
+    'Auto',
+    'PV Charge Limit',
+    'Discharge Limit',
+    'PV Charge and Discharge Limit',
+    'Charge from Grid',
+    'Discharge to Grid',
+    'Block Discharging',
+    'Block Charging',
+#    'Calibrate',
+)
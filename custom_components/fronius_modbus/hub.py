@@ -1,6 +1,7 @@
 """Fronius Modbus Hub."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import timedelta
 from typing import Optional
@@ -14,6 +15,7 @@ from .froniusmodbusclient import FroniusModbusClient
 
 from .const import (
     DOMAIN,
+    SLOW_REFRESH_CYCLES,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,6 +24,20 @@ class Hub:
     """Hub for Fronius Battery Storage Modbus Interface"""
 
     PYMODBUS_VERSION = '3.8.3'
+    _pymodbus_version_checked = False
+
+    # client setters indexed by extended storage control mode
+    _MODE_SETTERS = (
+        'set_auto_mode',
+        'set_charge_mode',
+        'set_discharge_mode',
+        'set_charge_discharge_mode',
+        'set_grid_charge_mode',
+        'set_grid_discharge_mode',
+        'set_block_discharge_mode',
+        'set_block_charge_mode',
+        'set_calibrate_mode',
+    )
 
     def __init__(self, hass: HomeAssistant, name: str, host: str, port: int, inverter_unit_id: int, meter_unit_ids, scan_interval: int) -> None:
         """Init hub."""
@@ -34,33 +50,44 @@ class Hub:
         self._client = FroniusModbusClient(host=host, port=port, inverter_unit_id=inverter_unit_id, meter_unit_ids=meter_unit_ids, timeout=max(3, (scan_interval - 1)))
         self._scan_interval = timedelta(seconds=scan_interval)
         self._unsub_interval_method = None
-        self._entities = []
+        self._entities = set()
         self._entities_dict = {}
-        self._busy = False
+        self._lock = asyncio.Lock()
+        self._refresh_counter = 0
 
     def toggle_busy(func):
         async def wrapper(self, *args, **kwargs):
-            if self._busy:
+            if self._lock.locked():
                 #_LOGGER.debug(f"skip {func.__name__} hub busy") 
                 return
-            self._busy = True
-            error = None
-            try:
-                result = await func(self, *args, **kwargs)
-            except Exception as e:
-                _LOGGER.warning(f'Exception in wrapper {e}')
-                error = e
-            self._busy = False
-            if not error is None:
-                raise error
-            return result
+            async with self._lock:
+                try:
+                    return await func(self, *args, **kwargs)
+                except Exception as e:
+                    _LOGGER.warning(f'Exception in wrapper {e}')
+                    raise
+        return wrapper
+
+    def wait_busy(func):
+        async def wrapper(self, *args, **kwargs):
+            # writes wait for a running refresh instead of being dropped
+            async with self._lock:
+                try:
+                    return await func(self, *args, **kwargs)
+                except Exception as e:
+                    _LOGGER.warning(f'Exception in wrapper {e}')
+                    raise
         return wrapper
 
     @toggle_busy
-    async def init_data(self, close = False, read_status_data = False):
-        await self._hass.async_add_executor_job(self.check_pymodbus_version)  
+    async def init_data(self, close = False, read_status_data = False, storage_info = None):
+        if not Hub._pymodbus_version_checked:
+            await self._hass.async_add_executor_job(self.check_pymodbus_version)
         result = await self._client.init_data()
 
+        if not storage_info is None:
+            self._client.storage_info = storage_info
+
         if self.storage_configured:
             result : bool = await self._hass.async_add_executor_job(self._client.get_json_storage_info)                
 
@@ -74,6 +101,7 @@ class Hub:
         elif version('pymodbus') > self.PYMODBUS_VERSION:
             _LOGGER.warning(f"newer pymodbus {version('pymodbus')} found")
         _LOGGER.debug(f"pymodbus {version('pymodbus')}")      
+        Hub._pymodbus_version_checked = True
 
     @property 
     def device_info_storage(self) -> dict:
@@ -121,7 +149,7 @@ class Hub:
             self._unsub_interval_method = async_track_time_interval(
                 self._hass, self.async_refresh_modbus_data, self._scan_interval
             )
-        self._entities.append(update_callback)
+        self._entities.add(update_callback)
 
     @callback
     def async_remove_hub_entity(self, update_callback):
@@ -141,56 +169,57 @@ class Hub:
         if not self._entities:
             return False
 
-        try:
-            update_result = await self._client.read_inverter_data()
-        except Exception as e:
-            _LOGGER.exception("Error reading inverter data", exc_info=True)
-            update_result = False
-
-        try:
-            update_result = await self._client.read_inverter_status_data()
-        except Exception as e:
-            _LOGGER.exception("Error reading inverter status data", exc_info=True)
-            update_result = False
-
-        try:
-            update_result = await self._client.read_inverter_model_settings_data()
-        except Exception as e:
-            _LOGGER.exception("Error reading inverter model settings data", exc_info=True)
-            update_result = False
+        # settings and controls only change on user action, read them every n-th refresh
+        slow_refresh = self._refresh_counter % SLOW_REFRESH_CYCLES == 0
+        self._refresh_counter += 1
 
+        # sequential, all units share one connection and pymodbus runs one transaction at a time
         try:
-            update_result = await self._client.read_inverter_controls_data()
+            await self._client.read_inverter_block(include_settings=slow_refresh)
         except Exception as e:
-            _LOGGER.exception("Error reading inverter model settings data", exc_info=True)
-            update_result = False
-
+            _LOGGER.exception("Error reading inverter register block", exc_info=True)
         if self._client.meter_configured:
-            for meter_address in self._client._meter_unit_ids:
-                try:
-                    update_result = await self._client.read_meter_data(meter_prefix="m1_", unit_id=meter_address)
-                except Exception as e:
-                    _LOGGER.error(f"Error reading meter data {meter_address}.", exc_info=True)
-                    #update_result = False
-
-        if self._client.mppt_configured:
             try:
-                update_result = await self._client.read_mppt_data()
+                await self._client.read_meter_blocks()
             except Exception as e:
-                _LOGGER.exception("Error reading mptt data", exc_info=True)
-                update_result = False
-        
-        if self._client.storage_configured:
+                _LOGGER.exception("Error reading meter register blocks", exc_info=True)
+        # skip status, settings and mppt while the inverter is idle (e.g. at night)
+        inverter_active = not self._client.inverter_idle
+
+        readers = [
+            ('inverter data', self._client.read_inverter_data, True),
+            ('inverter status data', self._client.read_inverter_status_data, inverter_active),
+            ('inverter model settings data', self._client.read_inverter_model_settings_data, inverter_active and slow_refresh),
+            ('inverter controls data', self._client.read_inverter_controls_data, inverter_active and slow_refresh),
+            ('meter data', self._read_meters_data, self._client.meter_configured),
+            ('mppt data', self._client.read_mppt_data, self._client.mppt_configured and inverter_active),
+            ('inverter storage data', self._client.read_inverter_storage_data, self._client.storage_configured),
+        ]
+
+        update_result = False
+        for name, reader, enabled in readers:
+            if not enabled:
+                continue
             try:
-                update_result = await self._client.read_inverter_storage_data()
+                update_result |= bool(await reader())
             except Exception as e:
-                _LOGGER.exception("Error reading inverter storage data", exc_info=True)
-                update_result = False
-
+                _LOGGER.exception(f"Error reading {name}", exc_info=True)
 
         if update_result:
             for update_callback in self._entities:
                 update_callback()
+        return update_result
+
+    async def _read_meters_data(self) -> bool:
+        # only meters whose register block was read this refresh, the others are backing off
+        result = False
+        for meter_address in self._client._meters_read:
+            try:
+                if await self._client.read_meter_data(meter_prefix=self._client._meter_prefixes[meter_address], unit_id=meter_address):
+                    result = True
+            except Exception as e:
+                _LOGGER.error(f"Error reading meter data {meter_address}.", exc_info=True)
+        return result
 
     @toggle_busy
     async def test_connection(self) -> bool:
@@ -218,6 +247,16 @@ class Hub:
     def storage_configured(self):
         return self._client.storage_configured
 
+    @property
+    def storage_info(self):
+        return self._client.storage_info
+
+    async def refresh_storage_info(self) -> bool:
+        """Re-read the storage details over http, returns True when they changed (e.g. battery swapped)."""
+        cached = self._client.storage_info
+        await self._hass.async_add_executor_job(self._client.get_json_storage_info, False)
+        return self._client.storage_info != cached
+
     @property
     def max_discharge_rate_w(self):
         return self._client.max_discharge_rate_w
@@ -230,44 +269,29 @@ class Hub:
     def storage_extended_control_mode(self):
         return self._client.storage_extended_control_mode
 
-    @toggle_busy
+    @wait_busy
     async def set_mode(self, mode):
-        if mode == 0:
-            await self._client.set_auto_mode()
-        elif mode == 1:
-            await self._client.set_charge_mode()
-        elif mode == 2:
-            await self._client.set_discharge_mode()
-        elif mode == 3:
-            await self._client.set_charge_discharge_mode()
-        elif mode == 4:
-            await self._client.set_grid_charge_mode()
-        elif mode == 5:
-            await self._client.set_grid_discharge_mode()
-        elif mode == 6:
-            await self._client.set_block_discharge_mode()
-        elif mode == 7:
-            await self._client.set_block_charge_mode()
-        elif mode == 8:
-            await self._client.set_calibrate_mode()
+        if mode is None or not 0 <= mode < len(self._MODE_SETTERS):
+            return
+        await getattr(self._client, self._MODE_SETTERS[mode])()
 
-    @toggle_busy
+    @wait_busy
     async def set_minimum_reserve(self, value):
         await self._client.set_minimum_reserve(value)
 
-    @toggle_busy
+    @wait_busy
     async def set_charge_limit(self, value):
         await self._client.set_charge_limit(value)
 
-    @toggle_busy
+    @wait_busy
     async def set_discharge_limit(self, value):
         await self._client.set_charge_limit(value)
 
-    @toggle_busy
+    @wait_busy
     async def set_grid_charge_power(self, value):
         await self._client.set_grid_charge_power(value)
            
-    @toggle_busy
+    @wait_busy
     async def set_grid_discharge_power(self, value):
         await self._client.set_grid_discharge_power(value)
 
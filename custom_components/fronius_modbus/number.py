@@ -53,6 +53,11 @@ async def async_setup_entry(hass, config_entry, async_add_entities) -> None:
 class FroniusModbusNumber(FroniusModbusBaseEntity, NumberEntity):
     """Representation of an Battery Storage Modbus number."""
 
+    @callback
+    def _modbus_data_updated(self):
+        # availability follows the storage control mode, write even when the value is unchanged
+        self.async_write_ha_state()
+
     @property
     def state(self):
         """Return the state of the sensor."""
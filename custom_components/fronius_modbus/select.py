@@ -38,23 +38,16 @@ async def async_setup_entry(hass, config_entry, async_add_entities) -> None:
     async_add_entities(entities)
     return True
 
-def get_key(my_dict, search):
-    for k, v in my_dict.items():
-        if v == search:
-            return k
-    return None
-
 class FroniusModbusSelect(FroniusModbusBaseEntity, SelectEntity):
     """Representation of an Battery Storage select."""
 
     @property
     def current_option(self) -> str:
-        if self._key in self._hub.data:
-            return self._hub.data[self._key]
+        return self._hub.data.get(self._key)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        new_mode = get_key(self._options_dict, option)
+        new_mode = self._options_inverse.get(option)
 
         await self._hub.set_mode(new_mode)
 
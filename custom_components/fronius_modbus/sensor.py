@@ -9,7 +9,6 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.const import CONF_NAME #, CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.icon import icon_for_battery_level
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import Entity
 from homeassistant.core import callback
@@ -126,17 +125,12 @@ class FroniusModbusSensor(FroniusModbusBaseEntity, SensorEntity):
     @property
     def state(self):
         """Return the state of the sensor."""
-        if self._key in self._hub.data:
-            value = self._hub.data[self._key]
-            if isinstance(value, str):
-                if len(value)>255:
-                    value = value[:255]
-                    _LOGGER.error(f'state length > 255. k: {self._key} v: {value}')
-            return value
-
-            # self._icon = icon_for_battery_level(
-            #     battery_level=self.native_value, charging=False
-            # )                
+        value = self._hub.data.get(self._key)
+        if isinstance(value, str):
+            if len(value)>255:
+                value = value[:255]
+                _LOGGER.error(f'state length > 255. k: {self._key} v: {value}')
+        return value
 
     @property
     def extra_state_attributes(self):